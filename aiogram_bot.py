@@ -150,7 +150,7 @@ class AiogramBot:
                 current_time = time.time()
                 if self._auth_status is not None and current_time - self._auth_status_time < self._auth_status_cache_time:
                     await processing_msg.delete()
-                    await message.reply(self._auth_status)
+                    await message.reply(self._auth_status + self.entity_cache_status())
                     return
 
                 # Проверяем статус подключения и авторизации
@@ -171,7 +171,7 @@ class AiogramBot:
                 self._auth_status_time = current_time
 
                 await processing_msg.delete()
-                await message.reply(status_text)
+                await message.reply(status_text + self.entity_cache_status())
 
         @self.dp.message(TelethonAuth.waiting_for_api_id)
         async def process_api_id(message: types.Message, state: FSMContext):
@@ -316,6 +316,16 @@ class AiogramBot:
             logger.debug(f"Получено сообщение от пользователя {message.from_user.id}")
             await message.answer(f"Вы написали: {message.text}")
 
+    def entity_cache_status(self):
+        """Текущая статистика кэша сущностей Telethon бота для /status"""
+        if self.telethon_bot is None or not self.telethon_bot.is_connected():
+            return ""
+
+        cache_stats = self.telethon_bot.entity_cache.stats()
+        return (f"\nКэш сущностей: {cache_stats['size']}/{cache_stats['max_size']}, "
+                f"попаданий {cache_stats['hit_rate']:.0%} "
+                f"({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']}).")
+
     async def save_auth_data(self, api_id, api_hash, phone):
         """Сохранение данных авторизации в файл"""
         auth_data = {
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from telethon import utils
+from telethon.tl import types
+
+from telethon_bot import TelethonBot
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Замер задержки TelethonBot.send_message для повторных чатов")
+    parser.add_argument("--chats", type=int, default=50, help="количество чатов в файле сессии")
+    parser.add_argument("--rounds", type=int, default=200, help="количество отправок в каждый чат")
+    parser.add_argument("--resolve-latency", type=float, default=0.0,
+                        help="дополнительная задержка разрешения сущности в миллисекундах (имитация сети)")
+    return parser.parse_args()
+
+
+async def measure(session_path, chat_ids, rounds, cache_size, resolve_latency):
+    """Среднее время send_message в микросекундах при заданном размере кэша"""
+    bot = TelethonBot(session_path, 1, "hash", entity_cache_size=cache_size)
+    client = bot.client
+
+    # Отправка не уходит в сеть: замеряется только разрешение сущности
+    async def send_message(peer, text):
+        return peer
+
+    client.send_message = send_message
+
+    if resolve_latency:
+        get_input_entity = client.get_input_entity
+
+        async def slow_get_input_entity(peer):
+            await asyncio.sleep(resolve_latency / 1000)
+            return await get_input_entity(peer)
+
+        client.get_input_entity = slow_get_input_entity
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for chat_id in chat_ids:
+            await bot.send_message(chat_id, "ping")
+    elapsed = time.perf_counter() - start
+
+    stats = bot.entity_cache.stats()
+    client.session.close()
+    return elapsed / (rounds * len(chat_ids)) * 1_000_000, stats
+
+
+async def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        session_path = os.path.join(directory, "benchmark_session")
+
+        # Заполняем файл сессии пользователями, как после обычной работы клиента
+        bot = TelethonBot(session_path, 1, "hash")
+        users = [types.User(id=user_id, access_hash=user_id, first_name=f"user{user_id}")
+                 for user_id in range(1, args.chats + 1)]
+        bot.client.session.process_entities(users)
+        bot.client.session.save()
+        bot.client.session.close()
+        chat_ids = [utils.get_peer_id(types.PeerUser(user.id)) for user in users]
+
+        without_cache, _ = await measure(session_path, chat_ids, args.rounds, 0, args.resolve_latency)
+        with_cache, stats = await measure(session_path, chat_ids, args.rounds, args.chats, args.resolve_latency)
+
+    print(f"Чатов: {args.chats}, отправок в чат: {args.rounds}, задержка разрешения: {args.resolve_latency} мс")
+    print(f"Без кэша: {without_cache:.1f} мкс на отправку")
+    print(f"С кэшем:  {with_cache:.1f} мкс на отправку (ускорение x{without_cache / with_cache:.1f})")
+    print(f"Статистика кэша: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
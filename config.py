@@ -10,6 +10,9 @@ AUTH_DATA_FILE = "auth_data.json"
 # Telethon session filename
 TELETHON_SESSION_FILENAME = 'telethon_session'
 
+# Entity cache size (number of peers kept in memory)
+ENTITY_CACHE_SIZE = 1000
+
 # Restart parameters
 MAX_RESTART_ATTEMPTS = 5
 RESTART_DELAY = 10
@@ -1,20 +1,113 @@
-from telethon import TelegramClient, events
+from collections import OrderedDict
+from telethon import TelegramClient, events, utils
 from telethon.errors import SessionPasswordNeededError
-from config import logger
+from telethon.sessions import SQLiteSession
+from telethon.tl import types
+from telethon.tl.types import (
+    UpdateUser, UpdateUserName, UpdateUserPhone, UpdateChannel, UpdateChat, UpdateChatParticipants
+)
+from config import logger, ENTITY_CACHE_SIZE
+
+# Обновления, после которых закэшированные данные о пользователе или чате могут устареть
+_INVALIDATING_UPDATES = (
+    UpdateUser, UpdateUserName, UpdateUserPhone, UpdateChannel, UpdateChat, UpdateChatParticipants
+)
+
+
+class EntityCache:
+    """LRU-кэш input-сущностей (пиров) поверх сессии Telethon"""
+
+    def __init__(self, max_size=ENTITY_CACHE_SIZE):
+        self.max_size = max_size
+        self._peers = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._peers)
+
+    def get(self, peer_id):
+        """Получение пира из кэша с обновлением его позиции в LRU"""
+        peer = self._peers.get(peer_id)
+        if peer is None:
+            self.misses += 1
+            return None
+        self._peers.move_to_end(peer_id)
+        self.hits += 1
+        return peer
+
+    def put(self, peer_id, peer):
+        """Добавление пира в кэш с вытеснением самого старого при переполнении"""
+        if peer_id is None or peer is None:
+            return
+        self._peers[peer_id] = peer
+        self._peers.move_to_end(peer_id)
+        while len(self._peers) > self.max_size:
+            self._peers.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, peer_id):
+        """Удаление пира из кэша"""
+        if self._peers.pop(peer_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self):
+        """Полная очистка кэша"""
+        self._peers.clear()
+
+    def hit_rate(self):
+        """Доля попаданий в кэш"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Счетчики кэша"""
+        return {
+            "size": len(self._peers),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hit_rate(),
+        }
+
+
+def _make_input_peer(marked_id, access_hash):
+    """Построение input-пира из помеченного ID и access hash, как они хранятся в сессии"""
+    real_id, peer_type = utils.resolve_id(marked_id)
+    if peer_type is types.PeerUser:
+        return types.InputPeerUser(real_id, access_hash)
+    if peer_type is types.PeerChat:
+        return types.InputPeerChat(real_id)
+    return types.InputPeerChannel(real_id, access_hash)
+
 
 class TelethonBot:
-    def __init__(self, session_filename, api_id, api_hash):
+    def __init__(self, session_filename, api_id, api_hash, entity_cache_size=ENTITY_CACHE_SIZE):
         self.client = TelegramClient(session_filename, api_id, api_hash)
+        self.entity_cache = EntityCache(entity_cache_size)
+        self._me = None
+
+        # Инвалидация кэша при обновлении пользователей и чатов
+        self.client.add_event_handler(self._invalidate_entities, events.Raw(types=_INVALIDATING_UPDATES))
+
         logger.info(f"Инициализация Telethon бота с сессией {session_filename}")
 
     async def connect(self):
         """Подключение к серверам Telegram"""
         await self.client.connect()
         logger.info("Telethon бот подключен к серверам Telegram")
+        self.warm_up_entity_cache()
         return self.client.is_connected()
 
     async def disconnect(self):
         """Отключение от серверов Telegram"""
+        logger.info(f"Статистика кэша сущностей: {self.entity_cache.stats()}")
+        self.entity_cache.clear()
+        self._me = None
         await self.client.disconnect()
         logger.info("Telethon бот отключен от серверов Telegram")
 
@@ -32,6 +125,7 @@ class TelethonBot:
 
     async def sign_in(self, phone=None, code=None, password=None):
         """Авторизация в Telegram"""
+        self._me = None
         if password:
             return await self.client.sign_in(password=password)
         else:
@@ -39,7 +133,70 @@ class TelethonBot:
 
     async def get_me(self):
         """Получение информации о текущем пользователе"""
-        return await self.client.get_me()
+        if self._me is None:
+            self._me = await self.client.get_me()
+        return self._me
+
+    def warm_up_entity_cache(self):
+        """Прогрев кэша сущностями, сохраненными в файле сессии"""
+        session = self.client.session
+        if not isinstance(session, SQLiteSession):
+            logger.warning(f"Прогрев кэша сущностей пропущен: сессия {type(session).__name__} не является SQLiteSession")
+            return
+
+        # Запрос опирается на внутреннюю схему таблицы entities в SQLiteSession Telethon
+        try:
+            cursor = session._cursor()
+            try:
+                rows = cursor.execute(
+                    'select id, hash from entities order by date desc limit ?',
+                    (self.entity_cache.max_size,)
+                ).fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            logger.error(f"Ошибка при прогреве кэша сущностей: {e}")
+            return
+
+        # Самые свежие сущности добавляются последними, чтобы вытесняться позже остальных
+        for marked_id, access_hash in reversed(rows):
+            self.entity_cache.put(marked_id, _make_input_peer(marked_id, access_hash))
+        logger.info(f"Кэш сущностей прогрет из файла сессии: {len(self.entity_cache)} записей")
+
+    async def get_input_entity(self, peer_id):
+        """Получение input-сущности по ID с использованием кэша"""
+        # Кэш хранит пиры по помеченным ID, поэтому напрямую ищутся только числовые ID
+        if isinstance(peer_id, int):
+            peer = self.entity_cache.get(peer_id)
+            if peer is not None:
+                return peer
+
+        peer = await self.client.get_input_entity(peer_id)
+        if not isinstance(peer, types.InputPeerSelf):
+            self.entity_cache.put(utils.get_peer_id(peer), peer)
+        return peer
+
+    async def send_message(self, peer_id, text):
+        """Отправка сообщения в чат по его ID"""
+        peer = await self.get_input_entity(peer_id)
+        return await self.client.send_message(peer, text)
+
+    async def _invalidate_entities(self, update):
+        """Сброс устаревших записей кэша по обновлениям пользователей и чатов"""
+        if getattr(update, 'user_id', None) is not None:
+            peer = types.PeerUser(update.user_id)
+            if self._me is not None and self._me.id == update.user_id:
+                self._me = None
+        elif getattr(update, 'channel_id', None) is not None:
+            peer = types.PeerChannel(update.channel_id)
+        elif getattr(update, 'chat_id', None) is not None:
+            peer = types.PeerChat(update.chat_id)
+        elif getattr(getattr(update, 'participants', None), 'chat_id', None) is not None:
+            peer = types.PeerChat(update.participants.chat_id)
+        else:
+            return
+
+        self.entity_cache.invalidate(utils.get_peer_id(peer))
 
     async def register_handlers(self):
         """Регистрация обработчиков событий"""
@@ -59,4 +216,4 @@ class TelethonBot:
         async def telethon_echo_handler(event):
             if event.text not in ['/start', '/help']:
                 logger.info(f"Получено сообщение в Telethon боте: {event.text}")
-                await event.respond(f"Вы написали: {event.text}")
\ No newline at end of file
+                await event.respond(f"Вы написали: {event.text}")
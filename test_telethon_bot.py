@@ -0,0 +1,150 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+from telethon import utils
+from telethon.sessions import MemorySession
+from telethon.tl import types
+
+from telethon_bot import EntityCache, TelethonBot
+
+
+def make_user(user_id):
+    return types.User(id=user_id, access_hash=user_id * 10, first_name=f"user{user_id}")
+
+
+def make_channel(channel_id):
+    return types.Channel(
+        id=channel_id, title=f"channel{channel_id}", photo=types.ChatPhotoEmpty(), date=None,
+        access_hash=channel_id * 10
+    )
+
+
+@pytest.fixture
+def session_path():
+    with tempfile.TemporaryDirectory() as directory:
+        yield os.path.join(directory, "test_session")
+
+
+class FakeClient:
+    """Заглушка клиента, считающая обращения к get_input_entity"""
+
+    def __init__(self, session):
+        self.session = session
+        self.resolved = []
+
+    async def get_input_entity(self, peer):
+        self.resolved.append(peer)
+        return self.session.get_input_entity(peer)
+
+
+def make_bot(session_path, entities=(), cache_size=10):
+    bot = TelethonBot(session_path, 1, "hash", entity_cache_size=cache_size)
+    session = bot.client.session
+    session.process_entities(list(entities))
+    session.save()
+    bot.client = FakeClient(session)
+    return bot
+
+
+def test_cache_evicts_least_recently_used():
+    cache = EntityCache(max_size=2)
+    cache.put(1, "one")
+    cache.put(2, "two")
+    assert cache.get(1) == "one"
+
+    cache.put(3, "three")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+    assert cache.evictions == 1
+
+
+def test_cache_invalidate_and_counters():
+    cache = EntityCache(max_size=2)
+    cache.put(1, "one")
+    cache.invalidate(1)
+    cache.invalidate(1)
+
+    assert cache.get(1) is None
+    cache.put(1, "one")
+    assert cache.get(1) == "one"
+
+    assert cache.invalidations == 1
+    assert cache.hit_rate() == 0.5
+    assert cache.stats() == {
+        "size": 1, "max_size": 2, "hits": 1, "misses": 1,
+        "evictions": 0, "invalidations": 1, "hit_rate": 0.5,
+    }
+
+
+def test_cache_hit_rate_without_lookups():
+    assert EntityCache().hit_rate() == 0.0
+
+
+def test_warm_up_uses_marked_ids(session_path):
+    async def scenario():
+        bot = make_bot(session_path, [make_user(1), make_channel(2)])
+        bot.warm_up_entity_cache()
+        return bot
+
+    bot = asyncio.run(scenario())
+
+    assert bot.entity_cache.get(1) == types.InputPeerUser(1, 10)
+    assert bot.entity_cache.get(utils.get_peer_id(types.PeerChannel(2))) == types.InputPeerChannel(2, 20)
+
+
+def test_warm_up_skips_non_sqlite_session(session_path):
+    async def scenario():
+        bot = make_bot(session_path)
+        bot.client.session = MemorySession()
+        bot.warm_up_entity_cache()
+        return bot
+
+    bot = asyncio.run(scenario())
+
+    assert len(bot.entity_cache) == 0
+
+
+def test_get_input_entity_resolves_once_per_id(session_path):
+    async def scenario():
+        bot = make_bot(session_path, [make_user(1)])
+        return bot, await bot.get_input_entity(1), await bot.get_input_entity(1)
+
+    bot, first, second = asyncio.run(scenario())
+
+    assert first == second == types.InputPeerUser(1, 10)
+    assert bot.client.resolved == [1]
+    assert bot.entity_cache.hits == 1
+    assert bot.entity_cache.misses == 1
+
+
+def test_get_input_entity_stores_usernames_under_marked_id(session_path):
+    user = make_user(1)
+    user.username = "someone"
+
+    async def scenario():
+        bot = make_bot(session_path, [user])
+        await bot.get_input_entity("someone")
+        return bot
+
+    bot = asyncio.run(scenario())
+
+    assert bot.entity_cache.misses == 0
+    assert bot.entity_cache.get(1) == types.InputPeerUser(1, 10)
+
+
+def test_update_invalidates_cached_peer(session_path):
+    async def scenario():
+        bot = make_bot(session_path, [make_user(1), make_channel(2)])
+        bot.warm_up_entity_cache()
+        await bot._invalidate_entities(types.UpdateUser(user_id=1))
+        await bot._invalidate_entities(types.UpdateChannel(channel_id=2))
+        return bot
+
+    bot = asyncio.run(scenario())
+
+    assert len(bot.entity_cache) == 0
+    assert bot.entity_cache.invalidations == 2